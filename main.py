@@ -5,28 +5,70 @@ Fetch weather → Render HTML → Screenshot → Display on e-ink
 """
 
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 import requests
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import time
 import subprocess
+import shutil
 from PIL import Image
 import json
+import hashlib
+import base64
+import os
+import random
+import struct
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from weather_client import EXECUTOR, LAST_DATA_PATH, json_loads, fetch as fetch_weather
 
 # Configuration file
 CONFIG_FILE = Path("config.json")
 
-# API Key
-API_KEY = Path("API_keys/avwxkeys.txt").read_text().strip()
-
 # Paths
 TEMPLATE = Path("templates/page.html")
-HTML_OUT = Path("output/weather.html")
-PNG_OUT = Path("output/weather.png")
+
+# Keep the per-cycle HTML/PNG on tmpfs when available - Chromium reads
+# them straight back, so there's no reason to wear the SD card
+if Path("/dev/shm").exists():
+    WORK_DIR = Path("/dev/shm/weather")
+else:
+    WORK_DIR = Path("output")
+HTML_OUT = WORK_DIR / "weather.html"
+PNG_OUT = WORK_DIR / "weather.png"
+
+# Persistent caches stay on disk so they survive reboots
+LAST_HASH_FILE = Path("output/.last_hash")
+PX_HASH_FILE = Path("output/.last_px.hash")
+
+# Jinja environment built once at import; the bytecode cache persists the
+# compiled template across restarts so it's never reparsed
+_JINJA_CACHE = Path("output/.jinja_cache")
+_JINJA_CACHE.mkdir(parents=True, exist_ok=True)
+_ENV = Environment(loader=FileSystemLoader(TEMPLATE.parent),
+                   bytecode_cache=FileSystemBytecodeCache(str(_JINJA_CACHE)),
+                   auto_reload=False)
+# Static asset prefix - compiles to plain string concatenation in the
+# template, unlike a url_for() call per asset
+_ENV.globals['STATIC'] = 'static/'
+_TEMPLATE = _ENV.get_template(TEMPLATE.name)
 
 # Cache for last displayed data
 LAST_DATA = None
-LAST_CONFIG_MTIME = 0
+LAST_HASH = None
+
+# Parsed config cache; -1 mtime so the first config_changed() call fires
+CONFIG = None
+LAST_CONFIG_MTIME = -1
+
+# When the next METAR is expected (issuance + ~1h); None = fetch now
+NEXT_UPDATE = None
+
+# How early to start polling before the expected issuance
+UPDATE_TOLERANCE = timedelta(seconds=120)
 
 # Try to import e-paper display
 try:
@@ -36,6 +78,91 @@ except:
     HAS_DISPLAY = False
     print("⚠ No e-paper display available")
 
+# Try to import numpy for the fast framebuffer pack
+try:
+    import numpy as np
+    # 7-color palette of the epd7in3f panel, in panel index order
+    EPD_PALETTE = np.array([[0, 0, 0], [255, 255, 255], [0, 255, 0], [0, 0, 255],
+                            [255, 0, 0], [255, 255, 0], [255, 128, 0]], dtype=np.int16)
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Try Playwright for the persistent browser (preferred, same optional
+# pattern as preview.py); CDP via websocket-client is the next choice
+try:
+    from playwright.sync_api import sync_playwright
+    HAS_PLAYWRIGHT = True
+except ImportError:
+    HAS_PLAYWRIGHT = False
+
+# Try to import websocket-client for driving a persistent Chromium
+try:
+    import websocket
+    HAS_WEBSOCKET = True
+except ImportError:
+    HAS_WEBSOCKET = False
+
+# Playwright singletons (started on first screenshot)
+_PW = None
+_PW_BROWSER = None
+_PW_PAGE = None
+
+# PIL palette image holding the panel's 7 colors in panel index order,
+# used to quantize the screenshot once at render time
+_PAL_IMAGE = Image.new("P", (1, 1))
+_PAL_IMAGE.putpalette((0, 0, 0, 255, 255, 255, 0, 255, 0, 0, 0, 255,
+                       255, 0, 0, 255, 255, 0, 255, 128, 0) + (0, 0, 0) * 249)
+
+# Persistent headless Chromium (started on first screenshot)
+CDP_PORT = 9222
+_BROWSER = None
+
+# Cores for Chromium children while the poller sits pinned on core 0 -
+# every launch path must hand these back or the render crawls on one core
+CHROMIUM_CORES = {1, 2, 3}
+
+def _spread_affinity():
+    """preexec hook: lift the inherited core-0 pin off a Chromium child"""
+    try:
+        os.sched_setaffinity(0, CHROMIUM_CORES)
+    except (AttributeError, OSError):
+        pass
+
+# Port of the localhost server for the work dir (started on first use)
+_HTTP_PORT = None
+
+def start_http_server():
+    """Serve the work dir on localhost for Chromium
+
+    file:// URLs defeat Chromium's HTTP cache, so fonts/icons/CSS get
+    re-read on every screenshot; served over localhost the persistent
+    browser keeps them cached between navigations.
+    """
+    global _HTTP_PORT
+
+    if _HTTP_PORT is not None:
+        return _HTTP_PORT
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=str(WORK_DIR), **kwargs)
+
+        def log_message(self, format, *args):
+            pass  # Suppress logging
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), QuietHandler)
+    _HTTP_PORT = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return _HTTP_PORT
+
+def page_url():
+    """URL for Chromium to load - localhost if the server is up, else file://"""
+    try:
+        return f"http://127.0.0.1:{start_http_server()}/weather.html"
+    except OSError:
+        return f"file://{HTML_OUT.absolute()}"
+
 def load_config():
     """Load configuration from JSON file"""
     if not CONFIG_FILE.exists():
@@ -62,93 +189,227 @@ def config_changed():
     if current_mtime != LAST_CONFIG_MTIME:
         LAST_CONFIG_MTIME = current_mtime
         return True
-    
+
     return False
 
-def fetch_weather(airport):
-    """Get weather data from AVWX API"""
-    headers = {"Authorization": f"Bearer {API_KEY}"}
-    
-    # Get METAR
-    metar = requests.get(f"https://avwx.rest/api/metar/{airport}?remove=true", 
-                         headers=headers, timeout=10).json()
-    
-    # Get Station
-    try:
-        station = requests.get(f"https://avwx.rest/api/station/{airport}", 
-                              headers=headers, timeout=10).json()
-        arpt_name = station["name"]
-    except:
-        arpt_name = airport
-    
-    # Get TAF
-    try:
-        taf = requests.get(f"https://avwx.rest/api/taf/{airport}", 
-                          headers=headers, timeout=10).json()
-        tafraw = [line["sanitized"] for line in taf["forecast"]]
-    except:
-        tafraw = ["TAF not available"]
-    
-    # Extract weather data
-    winddir = metar["wind_direction"]["value"]
-    aarowdir = str((winddir + 180) % 360) + "deg"
-    
-    # Format wind direction with leading zeros (e.g., 040)
-    winddir_formatted = f"{winddir:03d}"
-    
-    # Format pressure to always show 4 digits (e.g., 29.10)
-    pressure = metar["altimeter"]["value"]
-    pressure_formatted = f"{pressure:.2f}"
-    
-    wxcodes = metar["wx_codes"]
-    maincode = wxcodes[0]["value"] if wxcodes else None
-    if not maincode:
-        has_low_clouds = any(layer.get("altitude", 999) < 100 for layer in metar["clouds"])
-        maincode = "CLOUDY" if has_low_clouds else "SKY CLEAR"
-    
-    dt = datetime.fromisoformat(metar["time"]["dt"].replace("Z", "+00:00"))
-    
-    return {
-        "arpt": metar["station"],
-        "ArptName": arpt_name,
-        "rules": metar["flight_rules"],
-        "vis": metar["visibility"]["repr"],
-        "cig": [layer["repr"] for layer in metar["clouds"]],
-        "px": pressure_formatted,
-        "temp": metar["temperature"]["value"],
-        "dewpt": metar["dewpoint"]["value"],
-        "wind": metar["wind_speed"]["value"],
-        "gust": metar["wind_gust"],
-        "winddir": winddir_formatted,
-        "aarowdir": aarowdir,
-        "wxcode": [code["repr"] for code in wxcodes],
-        "pa": metar["pressure_altitude"],
-        "da": metar["density_altitude"],
-        "obs": maincode,
-        "tafraw": tafraw,
-        "time": dt.strftime("%Y-%m-%d %H:%M:%S %Z"),
-    }
+def get_config():
+    """Return the parsed config, re-reading only when the file changed"""
+    global CONFIG
+
+    if CONFIG is None or config_changed():
+        CONFIG = load_config()
+
+    return CONFIG
 
 def render_html(data):
     """Render Jinja template to HTML"""
-    env = Environment(loader=FileSystemLoader(TEMPLATE.parent))
-    env.globals['url_for'] = lambda endpoint, filename=None: f'static/{filename}' if filename else '#'
-    
-    template = env.get_template(TEMPLATE.name)
-    html = template.render(**data)
-    
     HTML_OUT.parent.mkdir(parents=True, exist_ok=True)
-    HTML_OUT.write_text(html)
-    
-    # Copy static files
-    import shutil
+    # Stream straight to the file - never materializes the whole page
+    # as one string
+    _TEMPLATE.stream(**data).dump(str(HTML_OUT), encoding="utf-8")
+
+    copy_static()
+
+def _fast_copytree(src, dst):
+    """copytree with the file copies fanned out over a small thread pool
+
+    SD-card reads overlap well even at small-file granularity, so the
+    CSS and SVGs land in one burst instead of seek-copy-seek-copy.
+    """
+    files = []
+    stack = [src]
+    while stack:
+        directory = stack.pop()
+        target = dst / directory.relative_to(src)
+        target.mkdir(parents=True, exist_ok=True)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(Path(entry.path))
+                else:
+                    files.append((entry.path, target / entry.name))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda pair: shutil.copy2(*pair), files))
+
+def copy_static():
+    """Copy static assets next to the HTML, skipped when nothing has changed"""
     static_src = Path("static")
-    static_dst = Path("output/static")
-    if static_src.exists():
-        shutil.copytree(static_src, static_dst, dirs_exist_ok=True)
+    static_dst = HTML_OUT.parent / "static"
+    sentinel = static_dst / ".copied_mtime"
+
+    if not static_src.exists():
+        return
+
+    src_mtime = max((p.stat().st_mtime for p in static_src.rglob('*') if p.is_file()),
+                    default=0)
+    if sentinel.exists() and float(sentinel.read_text()) >= src_mtime:
+        return
+
+    _fast_copytree(static_src, static_dst)
+    sentinel.write_text(str(src_mtime))
+
+def start_browser():
+    """Launch one headless Chromium with DevTools enabled, reused across updates"""
+    global _BROWSER
+
+    if _BROWSER is not None and _BROWSER.poll() is None:
+        return True
+
+    try:
+        _BROWSER = subprocess.Popen([
+            'chromium',
+            '--headless=new',
+            f'--remote-debugging-port={CDP_PORT}',
+            '--disable-gpu',
+            '--no-sandbox',
+            '--hide-scrollbars',
+            '--disable-dev-shm-usage',
+            '--force-device-scale-factor=1',
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        _BROWSER = None
+        return False
+
+    # Keep the browser off the poller's core (multi-core Pi only)
+    if hasattr(os, 'sched_setaffinity') and (os.cpu_count() or 1) >= 4:
+        try:
+            os.sched_setaffinity(_BROWSER.pid, CHROMIUM_CORES)
+        except OSError:
+            pass
+
+    # Wait for the DevTools endpoint to come up
+    for _ in range(50):
+        try:
+            requests.get(f"http://127.0.0.1:{CDP_PORT}/json/version", timeout=1)
+            return True
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.2)
+
+    print("  ✗ DevTools endpoint never came up")
+    return False
+
+def _get_page():
+    """Launch Playwright's Chromium once and reuse a fixed 800x480 page"""
+    global _PW, _PW_BROWSER, _PW_PAGE
+
+    if _PW_PAGE is None:
+        # Children inherit the poller's core-0 pin and Playwright never
+        # exposes the browser pid, so widen our own mask for the launch
+        # and snap back after - Chromium forks holding cores 1-3
+        restore_mask = None
+        if hasattr(os, 'sched_setaffinity') and (os.cpu_count() or 1) >= 4:
+            try:
+                restore_mask = os.sched_getaffinity(0)
+                os.sched_setaffinity(0, CHROMIUM_CORES)
+            except OSError:
+                restore_mask = None
+        try:
+            _PW = sync_playwright().start()
+            _PW_BROWSER = _PW.chromium.launch(args=['--disable-gpu', '--no-sandbox'])
+            _PW_PAGE = _PW_BROWSER.new_page(viewport={"width": 800, "height": 480})
+        finally:
+            if restore_mask is not None:
+                try:
+                    os.sched_setaffinity(0, restore_mask)
+                except OSError:
+                    pass
+
+    return _PW_PAGE
+
+def stop_browser():
+    """Shut down whichever persistent browser is running"""
+    if _PW_BROWSER is not None:
+        try:
+            _PW_BROWSER.close()
+            _PW.stop()
+        except Exception:
+            pass
+    if _BROWSER is not None and _BROWSER.poll() is None:
+        _BROWSER.terminate()
+
+def _cdp_command(ws, msg_id, method, params=None):
+    """Send one DevTools command and wait for its reply"""
+    ws.send(json.dumps({"id": msg_id, "method": method, "params": params or {}}))
+    while True:
+        reply = json.loads(ws.recv())
+        if reply.get("id") == msg_id:
+            return reply.get("result", {})
+
+def _screenshot_cdp():
+    """Screenshot via the persistent browser's DevTools protocol"""
+    tabs = requests.get(f"http://127.0.0.1:{CDP_PORT}/json", timeout=5).json()
+    page = next(tab for tab in tabs if tab["type"] == "page")
+
+    ws = websocket.create_connection(page["webSocketDebuggerUrl"], timeout=30)
+    try:
+        _cdp_command(ws, 1, "Emulation.setDeviceMetricsOverride",
+                     {"width": 800, "height": 480, "deviceScaleFactor": 1, "mobile": False})
+        _cdp_command(ws, 2, "Page.navigate", {"url": page_url()})
+        time.sleep(1)  # let the page lay out
+        result = _cdp_command(ws, 3, "Page.captureScreenshot", {"format": "png"})
+        PNG_OUT.write_bytes(base64.b64decode(result["data"]))
+    finally:
+        ws.close()
+
+def _verify_png():
+    """Open the screenshot and return it, or None if it wasn't created
+
+    Returning the Image means display() reuses this decode instead of
+    re-reading the PNG from disk.
+    """
+    if not PNG_OUT.exists():
+        print(f"  ✗ PNG not created")
+        return None
+
+    # PNG keeps its dimensions at a fixed offset in the IHDR chunk -
+    # peek those 8 bytes rather than going through Pillow for the check
+    with open(PNG_OUT, 'rb') as f:
+        header = f.read(24)
+    width, height = struct.unpack(">II", header[16:24])
+    print(f"  Screenshot: {width}x{height}")
+
+    # --window-size should make this exact; if Chromium disagrees,
+    # bilinear is plenty - anything finer is invisible after the
+    # 7-color quantization
+    if (width, height) != (800, 480):
+        img = Image.open(PNG_OUT).resize((800, 480), Image.Resampling.BILINEAR)
+        print(f"  Resized to: 800x480")
+    else:
+        img = Image.open(PNG_OUT)
+
+    # Quantize to the panel's palette now, with dithering. The saved
+    # PNG shrinks to a ~30 KB paletted file and the display pack sees
+    # ready-made palette indices instead of 24-bit RGB.
+    img = img.convert('RGB').quantize(palette=_PAL_IMAGE,
+                                      dither=Image.Dither.FLOYDSTEINBERG)
+    img.save(PNG_OUT, optimize=True)
+
+    return img
 
 def screenshot():
-    """Take screenshot with Chromium"""
+    """Take screenshot with Chromium, returning the decoded image"""
+    # Prefer a persistent browser - skips the multi-second cold start
+    if HAS_PLAYWRIGHT:
+        try:
+            print(f"  Using persistent chromium (Playwright)...")
+            page = _get_page()
+            page.goto(page_url())
+            page.screenshot(path=str(PNG_OUT), full_page=False)
+            return _verify_png()
+        except Exception as e:
+            print(f"  ✗ Playwright screenshot failed: {e}")
+            # Fall through to CDP / one-shot chromium
+
+    if HAS_WEBSOCKET and start_browser():
+        try:
+            print(f"  Using persistent chromium (CDP)...")
+            _screenshot_cdp()
+            return _verify_png()
+        except Exception as e:
+            print(f"  ✗ CDP screenshot failed: {e}")
+            # Fall through to a one-shot chromium run
+
     try:
         print(f"  Using chromium-browser...")
         subprocess.run([
@@ -156,105 +417,215 @@ def screenshot():
             '--headless',
             '--disable-gpu',
             '--no-sandbox',
-            '--kiosk',
+            '--window-size=800,480',
             '--hide-scrollbars',
             '--disable-dev-shm-usage',
             '--disable-software-rasterizer',
             '--force-device-scale-factor=1',
+            '--virtual-time-budget=500',
             f'--screenshot={PNG_OUT.absolute()}',
-            f'file://{HTML_OUT.absolute()}'
-        ], capture_output=True, timeout=60, check=True)
-        
-        # Verify the screenshot
-        if PNG_OUT.exists():
-            img = Image.open(PNG_OUT)
-            print(f"  Screenshot: {img.size[0]}x{img.size[1]}")
-            
-            # Resize to exact 800x480 if needed
-            if img.size != (800, 480):
-                img = img.resize((800, 480), Image.Resampling.LANCZOS)
-                img.save(PNG_OUT)
-                print(f"  Resized to: 800x480")
-            
-            return True
-        else:
-            print(f"  ✗ PNG not created")
-            return False
-            
+            page_url()
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+           preexec_fn=(_spread_affinity if hasattr(os, 'sched_setaffinity')
+                       and (os.cpu_count() or 1) >= 4 else None),
+           timeout=60, check=True)
+
+        return _verify_png()
+
     except subprocess.TimeoutExpired:
         print(f"  ✗ Timeout after 60 seconds")
         print(f"  Chromium is taking too long - may need more memory/CPU")
-        return False
+        return None
     except FileNotFoundError:
         print(f"  ✗ chromium-browser not found")
         print(f"  Install with: sudo apt install chromium-browser")
-        return False
+        return None
     except subprocess.CalledProcessError as e:
         print(f"  ✗ Chromium error: {e}")
-        return False
+        if e.stderr:
+            print(f"  {e.stderr.decode(errors='replace').strip().splitlines()[-1]}")
+        return None
+
+def fast_getbuffer(img):
+    """Vectorized epd.getbuffer: nearest palette color + 4-bit pack
+
+    The Waveshare getbuffer loops over all 384k pixels in Python; this
+    does the same quantize+pack as three numpy array ops.
+    """
+    if img.mode == 'P':
+        # Already quantized to the panel palette - pixels are indices
+        idx = np.asarray(img, dtype=np.uint8)
+    else:
+        arr = np.asarray(img.convert('RGB'), dtype=np.int16)
+        idx = np.argmin(((arr[:, :, None, :] - EPD_PALETTE) ** 2).sum(-1),
+                        axis=2).astype(np.uint8)
+    return ((idx[:, 0::2] << 4) | idx[:, 1::2]).tobytes()
+
+# Digest of the last framebuffer pushed to the panel (persisted, so a
+# restart that renders identical pixels doesn't refresh the panel)
+LAST_PX_HASH = None
+
+# Single EPD instance, reused across refreshes
+_EPD = None
+
+def _get_epd():
+    global _EPD
+    if _EPD is None:
+        _EPD = EPD()
+    return _EPD
+
+def _init_epd():
+    """Wake the panel; run in the background while Chromium renders"""
+    epd = _get_epd()
+    epd.init()
+    return epd
+
+def display(img, init_future=None):
+    """Show the already-decoded screenshot on the e-paper display"""
+    global LAST_PX_HASH
 
-def display():
-    """Show on e-paper display"""
     if not HAS_DISPLAY:
         print("⚠ Skipping display (no hardware)")
         return
-    
-    epd = EPD()
-    epd.init()
-    img = Image.open(PNG_OUT)
-    epd.display(epd.getbuffer(img))
+
+    epd = _get_epd()
+    if HAS_NUMPY:
+        buf = fast_getbuffer(img)
+    else:
+        buf = bytes(epd.getbuffer(img))
+
+    # Same pixels as last time - skip the slow full-panel refresh.
+    # Catches no-op refreshes the data-level hash can't (different
+    # data rendering to identical pixels), and survives restarts.
+    px_hash = hashlib.blake2b(buf, digest_size=16).hexdigest()
+    if px_hash == LAST_PX_HASH:
+        print("  Framebuffer unchanged - skipping e-paper refresh")
+        if init_future is not None:
+            init_future.result().sleep()  # panel was woken early, put it back
+        return
+
+    # Panel init was overlapped with the Chromium render
+    if init_future is not None:
+        epd = init_future.result()
+    else:
+        epd.init()
+
+    epd.display(buf)
     epd.sleep()
+    LAST_PX_HASH = px_hash
+    PX_HASH_FILE.write_text(px_hash)
+
+# Issuance timestamps change on every reissued METAR even when the
+# weather itself is identical - leave all of them out of the hash
+_TIMESTAMP_KEYS = frozenset(('time', 'issued_dt', 'time_dt_raw'))
+
+def data_hash(data):
+    """Stable hash of the weather fields, ignoring the timestamps"""
+    payload = {k: v for k, v in data.items() if k not in _TIMESTAMP_KEYS}
+    return hashlib.blake2b(
+        json.dumps(payload, sort_keys=True, default=str).encode(),
+        digest_size=16).hexdigest()
 
 def data_changed(new_data):
     """Check if weather data has changed (ignoring timestamp)"""
-    global LAST_DATA
-    
-    if LAST_DATA is None:
-        return True
-    
-    # Compare all fields except time
-    for key in new_data:
-        if key == 'time':
-            continue
-        if new_data[key] != LAST_DATA.get(key):
-            return True
-    
-    return False
+    return data_hash(new_data) != LAST_HASH
 
 def update(airport, force_refresh=False):
     """Full update cycle"""
-    global LAST_DATA
-    
+    global LAST_DATA, LAST_HASH, NEXT_UPDATE
+
     print(f"\n{'='*60}")
     print(f"Update: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {airport}")
     print(f"{'='*60}")
-    
+
     try:
         print("Fetching weather...")
-        data = fetch_weather(airport)
-        
+        last_dt = None if force_refresh else (LAST_DATA or {}).get("time_dt_raw")
+        data = fetch_weather(airport, last_dt=last_dt)
+
+        # Same METAR as the one on screen - retry at the configured
+        # interval until a fresh one is issued
+        if data is None:
+            print("📊 METAR not reissued yet - skipping refresh")
+            retry_interval = get_config().get("update_interval", 300)
+            NEXT_UPDATE = datetime.now(timezone.utc) + timedelta(seconds=retry_interval)
+            return
+
+        # Schedule the next fetch around the next expected issuance
+        # (roughly hourly, with jitter so we don't hammer AVWX on the
+        # minute); if this METAR is already old, fall back to the
+        # configured interval so we catch a late one
+        next_expected = (data["issued_dt"] + timedelta(minutes=60)
+                         + timedelta(seconds=random.randint(30, 90)))
+        now = datetime.now(timezone.utc)
+        if next_expected - UPDATE_TOLERANCE <= now:
+            retry_interval = get_config().get("update_interval", 300)
+            next_expected = now + timedelta(seconds=retry_interval)
+
+        # Unsettled weather gets SPECI reports between the hourly
+        # METARs - poll sooner when the field is gusty or IFR/LIFR
+        if data["gust"] or data["rules"] in ("IFR", "LIFR"):
+            next_expected = min(next_expected, now + timedelta(minutes=5))
+
+        NEXT_UPDATE = next_expected
+
         # Check if data has changed
         if not force_refresh and not data_changed(data):
             print("📊 No changes detected - skipping display refresh")
+            # Still adopt the reissued METAR's timestamps so the next
+            # cycle's short-circuit keys off the current issuance
+            LAST_DATA = data
+            LAST_DATA_PATH.write_text(json.dumps(data, default=str))
             return
         
         print("Rendering HTML...")
         render_html(data)
-        
+
+        # Wake the panel while Chromium renders, so its init time
+        # overlaps the screenshot instead of adding to it
+        init_future = EXECUTOR.submit(_init_epd) if HAS_DISPLAY else None
+
         print("Taking screenshot...")
-        if not screenshot():
+        img = screenshot()
+        if img is None:
+            if init_future is not None:
+                init_future.result().sleep()
             return
-        
+
         print("Displaying on e-paper...")
-        display()
-        
-        # Update the cache
-        LAST_DATA = data.copy()
+        display(img, init_future)
         
+        # Update the cache (persisted so a restart doesn't force a refresh).
+        # The dict is never mutated after this point, so no copy needed.
+        LAST_DATA = data
+        LAST_HASH = data_hash(data)
+        LAST_HASH_FILE.write_text(LAST_HASH)
+        LAST_DATA_PATH.write_text(json.dumps(data, default=str))
+
         print("✅ Update complete!")
         
     except Exception as e:
         print(f"❌ Error: {e}")
+        # Back off to the configured interval - otherwise the 20-second
+        # config loop re-enters update() on every tick while AVWX is down
+        retry_interval = get_config().get("update_interval", 300)
+        NEXT_UPDATE = datetime.now(timezone.utc) + timedelta(seconds=retry_interval)
+
+def set_cpu_affinity():
+    """Pin the poller to core 0 and deprioritize it vs Chromium
+
+    Chromium pegs the CPU during renders; keeping this process on its
+    own core (and slightly nicer) cuts context switches on the hot
+    rendering phase. No-op on single-core boards or non-Linux.
+    """
+    if not hasattr(os, 'sched_setaffinity') or (os.cpu_count() or 1) < 4:
+        return
+
+    try:
+        os.sched_setaffinity(0, {0})
+        os.nice(5)
+    except OSError:
+        pass
 
 def clear_display():
     """Clear the e-paper display and put it to sleep"""
@@ -263,7 +634,7 @@ def clear_display():
         return
     
     try:
-        epd = EPD()
+        epd = _get_epd()
         epd.init()
         epd.Clear()
         epd.sleep()
@@ -273,50 +644,58 @@ def clear_display():
 
 if __name__ == "__main__":
     # Load initial config
-    config = load_config()
+    config = get_config()
     current_airport = config["airport"]
     
     print(f"🚀 Starting weather dashboard")
     print(f"✈ Airport: {current_airport}")
     print(f"📝 Edit config.json to change settings")
     print("-" * 60)
+
+    set_cpu_affinity()
     
-    # Initialize config mtime
-    LAST_CONFIG_MTIME = CONFIG_FILE.stat().st_mtime
-    
+    # Restore the last displayed state so a restart with unchanged
+    # weather doesn't refetch or refresh anything; `--force` overrides
+    if LAST_HASH_FILE.exists():
+        LAST_HASH = LAST_HASH_FILE.read_text().strip()
+    if PX_HASH_FILE.exists():
+        LAST_PX_HASH = PX_HASH_FILE.read_text().strip()
+    try:
+        LAST_DATA = json_loads(LAST_DATA_PATH.read_bytes())
+        if LAST_DATA.get("arpt") != current_airport:
+            LAST_DATA = None  # Airport changed while we were down
+    except (FileNotFoundError, ValueError):
+        LAST_DATA = None
+
     # Run initial update
-    update(current_airport, force_refresh=True)
-    
-    # Track time for weather updates
-    last_update_time = time.time()
+    force_start = "--force" in sys.argv
+    update(current_airport, force_refresh=force_start or LAST_HASH is None)
+
     config_check_interval = 20  # Check config every 20 seconds
-    
+
     try:
         while True:
-            # Reload config
-            config = load_config()
-            
+            # Reload config (stat-only check unless the file was touched)
+            config = get_config()
+
             # Check if airport changed
             if config["airport"] != current_airport:
                 print(f"\n✈ Airport changed: {current_airport} → {config['airport']}")
                 current_airport = config["airport"]
                 LAST_DATA = None  # Force refresh
+                NEXT_UPDATE = None
                 update(current_airport, force_refresh=True)
-                last_update_time = time.time()  # Reset timer
             else:
-                # Check if it's time for a weather update
-                current_time = time.time()
-                time_since_update = current_time - last_update_time
-                update_interval = config.get("update_interval", 300)
-                
-                if time_since_update >= update_interval:
+                # Fetch when the next METAR is due (with a little lead time)
+                now = datetime.now(timezone.utc)
+                if NEXT_UPDATE is None or now >= NEXT_UPDATE - UPDATE_TOLERANCE:
                     if config.get("auto_update", True):
                         update(current_airport)
-                        last_update_time = time.time()
-            
+
             # Sleep for 20 seconds before checking config again
             time.sleep(config_check_interval)
                     
     except KeyboardInterrupt:
         print("\n\n🛑 Stopping...")
+        stop_browser()
         clear_display()
\ No newline at end of file
@@ -13,21 +13,46 @@ Features:
 """
 
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
-from datetime import datetime
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+from datetime import datetime, timezone
+from collections import ChainMap
+from types import MappingProxyType
 import webbrowser
 import argparse
+import atexit
+import os
 import shutil
 import http.server
 import socketserver
 import threading
 
+import weather_client
+
 # Configuration
 DEFAULT_AIRPORT = "KSKA"
 TEMPLATE = Path("templates/page.html")
 HTML_OUT = Path("output/weather.html")
 PNG_OUT = Path("output/weather.png")
 PORT = 8080
+TIME_FMT = "%Y-%m-%d %H:%M:%S UTC"
+
+# Jinja environment and compiled template, built lazily on first render.
+# The bytecode cache is shared with main.py so neither frontend ever
+# reparses a template the other already compiled.
+_ENV = None
+_TEMPLATE = None
+
+def _get_template():
+    global _ENV, _TEMPLATE
+    if _TEMPLATE is None:
+        cache_dir = Path("output/.jinja_cache")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _ENV = Environment(loader=FileSystemLoader(TEMPLATE.parent),
+                           bytecode_cache=FileSystemBytecodeCache(str(cache_dir)),
+                           auto_reload=False, cache_size=-1)
+        _ENV.globals['STATIC'] = 'static/'
+        _TEMPLATE = _ENV.get_template(TEMPLATE.name)
+    return _TEMPLATE
 
 # ============================================================================
 # MOCK DATA - Edit this to test different weather scenarios
@@ -56,7 +81,6 @@ MOCK_SCENARIOS = {
             "FM130000 VRB03KT P6SM SKC",
             "FM131500 28012KT P6SM FEW080"
         ],
-        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC"),
     },
     "ifr": {
         "arpt": "KSKA",
@@ -80,7 +104,6 @@ MOCK_SCENARIOS = {
             "FM130600 VRB05KT 3SM BR SCT010 BKN020",
             "FM131400 27008KT P6SM SCT030"
         ],
-        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC"),
     },
     "mvfr": {
         "arpt": "KSKA",
@@ -104,7 +127,6 @@ MOCK_SCENARIOS = {
             "FM130300 30010KT P6SM SCT030",
             "FM131200 28008KT P6SM FEW040"
         ],
-        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC"),
     },
     "stormy": {
         "arpt": "KSKA",
@@ -128,112 +150,39 @@ MOCK_SCENARIOS = {
             "FM122200 25015G25KT 2SM TSRA BKN010 OVC020",
             "FM130400 27010KT 5SM -RA SCT015 BKN030"
         ],
-        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC"),
     },
 }
 
+# Freeze the scenarios - get_mock_data hands out read-only views, so an
+# accidental write can't corrupt the canned data for later calls
+MOCK_SCENARIOS = {name: MappingProxyType(scenario)
+                  for name, scenario in MOCK_SCENARIOS.items()}
+
 
 def get_mock_data(scenario="clear"):
     """Get mock weather data for testing"""
     if scenario not in MOCK_SCENARIOS:
         print(f"Unknown scenario '{scenario}'. Available: {list(MOCK_SCENARIOS.keys())}")
         scenario = "clear"
-    
-    data = MOCK_SCENARIOS[scenario].copy()
-    data["time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
-    return data
+
+    # Layer the fresh timestamp over the frozen scenario - no dict copy
+    return ChainMap({"time": datetime.now(timezone.utc).strftime(TIME_FMT)},
+                    MOCK_SCENARIOS[scenario])
 
 
 def fetch_live_weather(airport, debug=False):
-    """Get real weather data from AVWX API (requires API key)"""
-    import requests
-    import json
-    
-    api_key_file = Path("API_keys/avwxkeys.txt")
-    if not api_key_file.exists():
+    """Get real weather data from AVWX API (requires API key)
+
+    Thin wrapper around the shared weather_client fetch, so main.py and
+    the preview always produce identically formatted data.
+    """
+    if not weather_client.API_KEY_FILE.exists():
         raise FileNotFoundError(
-            f"API key not found at {api_key_file}\n"
+            f"API key not found at {weather_client.API_KEY_FILE}\n"
             "Use --mock flag to test with mock data instead."
         )
-    
-    API_KEY = api_key_file.read_text().strip()
-    headers = {"Authorization": f"Bearer {API_KEY}"}
-    
-    # Get METAR
-    metar = requests.get(
-        f"https://avwx.rest/api/metar/{airport}?remove=true",
-        headers=headers, timeout=10
-    ).json()
-    
-    # Get Station name
-    try:
-        station = requests.get(
-            f"https://avwx.rest/api/station/{airport}",
-            headers=headers, timeout=10
-        ).json()
-        arpt_name = station["name"]
-    except:
-        arpt_name = airport
-    
-    # Get TAF
-    taf_raw_json = None
-    try:
-        taf = requests.get(
-            f"https://avwx.rest/api/taf/{airport}",
-            headers=headers, timeout=10
-        ).json()
-        taf_raw_json = taf
-        tafraw = [line["sanitized"] for line in taf["forecast"]]
-    except:
-        tafraw = ["TAF not available"]
-    
-    # Debug output
-    if debug:
-        print("\n" + "="*60)
-        print("RAW TAF JSON:")
-        print("="*60)
-        print(json.dumps(taf_raw_json, indent=2))
-        print("="*60)
-        print("\nPARSED tafraw list:")
-        for i, line in enumerate(tafraw):
-            print(f"  [{i}] '{line}'")
-        print("="*60 + "\n")
-    
-    # Extract weather data
-    winddir = metar["wind_direction"]["value"]
-    aarowdir = str((winddir + 180) % 360) + "deg"
-    
-    wxcodes = metar["wx_codes"]
-    maincode = wxcodes[0]["value"] if wxcodes else None
-    if not maincode:
-        has_low_clouds = any(
-            layer.get("altitude", 999) < 100 
-            for layer in metar["clouds"]
-        )
-        maincode = "CLOUDY" if has_low_clouds else "SKY CLEAR"
-    
-    dt = datetime.fromisoformat(metar["time"]["dt"].replace("Z", "+00:00"))
-    
-    return {
-        "arpt": metar["station"],
-        "ArptName": arpt_name,
-        "rules": metar["flight_rules"],
-        "vis": metar["visibility"]["repr"],
-        "cig": [layer["repr"] for layer in metar["clouds"]],
-        "px": metar["altimeter"]["value"],
-        "temp": metar["temperature"]["value"],
-        "dewpt": metar["dewpoint"]["value"],
-        "wind": metar["wind_speed"]["value"],
-        "gust": metar["wind_gust"],
-        "winddir": winddir,
-        "aarowdir": aarowdir,
-        "wxcode": [code["repr"] for code in wxcodes],
-        "pa": metar["pressure_altitude"],
-        "da": metar["density_altitude"],
-        "obs": maincode,
-        "tafraw": tafraw,
-        "time": dt.strftime("%Y-%m-%d %H:%M:%S %Z"),
-    }
+
+    return weather_client.fetch(airport, debug=debug)
 
 
 def render_html(data):
@@ -244,66 +193,108 @@ def render_html(data):
             "Please create your template or copy it from the Pi."
         )
     
-    env = Environment(loader=FileSystemLoader(TEMPLATE.parent))
-    env.globals['url_for'] = lambda endpoint, filename=None: f'static/{filename}' if filename else '#'
-    
-    template = env.get_template(TEMPLATE.name)
-    html = template.render(**data)
-    
     HTML_OUT.parent.mkdir(parents=True, exist_ok=True)
-    HTML_OUT.write_text(html)
-    
-    # Copy static files
+    # Stream straight to the file - never materializes the whole page
+    # as one string
+    _get_template().stream(**data).dump(str(HTML_OUT), encoding="utf-8")
+
+    copy_static()
+
+    return HTML_OUT
+
+
+def copy_static():
+    """Copy static assets to output/, skipped when nothing has changed"""
     static_src = Path("static")
     static_dst = Path("output/static")
-    if static_src.exists():
-        shutil.copytree(static_src, static_dst, dirs_exist_ok=True)
-    
-    return HTML_OUT
+    sentinel = static_dst / ".copied_mtime"
+
+    if not static_src.exists():
+        return
+
+    src_mtime = max((p.stat().st_mtime for p in static_src.rglob('*') if p.is_file()),
+                    default=0)
+    if sentinel.exists() and float(sentinel.read_text()) >= src_mtime:
+        return
+
+    shutil.copytree(static_src, static_dst, dirs_exist_ok=True)
+    sentinel.write_text(str(src_mtime))
+
+
+# One-time backend detection - retrying the imports on every call walks
+# sys.path each time just to fail over again
+try:
+    from playwright.sync_api import sync_playwright
+except ImportError:
+    sync_playwright = None
+try:
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+except ImportError:
+    webdriver = None
+
+# Playwright state, created on first screenshot and reused after that -
+# launching Chromium is by far the slowest part of a capture
+_PW = None
+_BROWSER = None
+_PAGE = None
+
+def _get_page():
+    """Lazily start Playwright once and hand back the same 800x480 page"""
+    global _PW, _BROWSER, _PAGE
+    if _PAGE is None:
+        _PW = sync_playwright().start()
+        _BROWSER = _PW.chromium.launch(
+            args=["--no-sandbox", "--disable-dev-shm-usage"])
+        _PAGE = _BROWSER.new_page(viewport={"width": 800, "height": 480})
+        atexit.register(_close_browser)
+    return _PAGE
+
+def _close_browser():
+    if _BROWSER is not None:
+        _BROWSER.close()
+    if _PW is not None:
+        _PW.stop()
+
+def _playwright_shot():
+    page = _get_page()
+    page.goto(f"file://{HTML_OUT.absolute()}")
+    page.screenshot(path=str(PNG_OUT))
+    return True
 
+def _selenium_shot():
+    options = Options()
+    options.add_argument("--headless")
+    options.add_argument("--window-size=800,480")
+    options.add_argument("--hide-scrollbars")
+    options.add_argument("--force-device-scale-factor=1")
+
+    driver = webdriver.Chrome(options=options)
+    driver.get(f"file://{HTML_OUT.absolute()}")
+    driver.save_screenshot(str(PNG_OUT))
+    driver.quit()
+    return True
+
+# Resolved once at import; take_screenshot just dispatches
+if sync_playwright is not None:
+    _SCREENSHOT = _playwright_shot
+elif webdriver is not None:
+    _SCREENSHOT = _selenium_shot
+else:
+    _SCREENSHOT = None
 
 def take_screenshot():
     """Take a screenshot using available browser"""
-    try:
-        from playwright.sync_api import sync_playwright
-        
-        with sync_playwright() as p:
-            browser = p.chromium.launch()
-            page = browser.new_page(viewport={"width": 780, "height": 500})
-            page.goto(f"file://{HTML_OUT.absolute()}")
-            page.screenshot(path=str(PNG_OUT))
-            browser.close()
-        
-        print(f"  ✓ Screenshot saved: {PNG_OUT}")
-        return True
-        
-    except ImportError:
-        print("  ℹ Playwright not installed. Trying Selenium...")
-    
-    try:
-        from selenium import webdriver
-        from selenium.webdriver.chrome.options import Options
-        
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--window-size=780,500")
-        options.add_argument("--hide-scrollbars")
-        options.add_argument("--force-device-scale-factor=1")
-        
-        driver = webdriver.Chrome(options=options)
-        driver.set_window_size(780, 635)
-        driver.get(f"file://{HTML_OUT.absolute()}")
-        driver.save_screenshot(str(PNG_OUT))
-        driver.quit()
-        
-        print(f"  ✓ Screenshot saved: {PNG_OUT}")
-        return True
-        
-    except ImportError:
-        print("  ℹ Selenium not installed. Skipping screenshot.")
+    if _SCREENSHOT is None:
+        print("  ℹ No screenshot backend installed. Skipping screenshot.")
         print("  ℹ Install with: pip install playwright && playwright install")
         print("  ℹ Or: pip install selenium webdriver-manager")
         return False
+
+    try:
+        _SCREENSHOT()
+        print(f"  ✓ Screenshot saved: {PNG_OUT}")
+        return True
     except Exception as e:
         print(f"  ✗ Screenshot failed: {e}")
         return False
@@ -316,11 +307,13 @@ def serve_and_open(port=PORT):
         def log_message(self, format, *args):
             pass  # Suppress logging
     
-    class ReusableTCPServer(socketserver.TCPServer):
+    # Threading so the browser's parallel CSS/SVG requests don't
+    # serialize behind the HTML response on first load
+    class ReusableTCPServer(socketserver.ThreadingTCPServer):
         allow_reuse_address = True
+        daemon_threads = True
     
     # Change to output directory
-    import os
     original_dir = os.getcwd()
     os.chdir("output")
     
@@ -380,6 +373,8 @@ Available scenarios: clear, ifr, mvfr, stormy
                         help="Generate PNG screenshot")
     parser.add_argument("--no-browser", "-n", action="store_true",
                         help="Don't open browser")
+    parser.add_argument("--file", "-f", action="store_true",
+                        help="Open the HTML directly (file://), no local server")
     parser.add_argument("--debug", "-d", action="store_true",
                         help="Show raw API data (JSON)")
     parser.add_argument("--port", "-p", type=int, default=PORT,
@@ -431,7 +426,14 @@ Available scenarios: clear, ifr, mvfr, stormy
     
     # Open browser (skip if --no-browser or if only taking screenshot)
     if not args.no_browser and not args.screenshot:
-        serve_and_open(args.port)
+        if args.file:
+            # The template's static/ paths are relative, so file:// works
+            # without the server + timer thread at all
+            url = f"file://{HTML_OUT.absolute()}"
+            print(f"\n🌐 Preview: {url}")
+            webbrowser.open(url)
+        else:
+            serve_and_open(args.port)
 
 
 if __name__ == "__main__":
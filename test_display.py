@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+E-paper display test pattern
+============================
+Pushes an 800x480 alignment/color pattern to the panel: a 100px grid,
+swatches of the seven epd7in3f colors, and corner labels. Run it after
+(re)seating the ribbon cable to check geometry and color order.
+
+Without the hardware attached it just saves the pattern to
+output/test_pattern.png so you can eyeball it.
+"""
+
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont
+import functools
+
+WIDTH, HEIGHT = 800, 480
+GRID = 100
+PNG_OUT = Path("output/test_pattern.png")
+FONT_PATH = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+# The panel's seven colors, in index order (same as main.EPD_PALETTE)
+COLORS = [(0, 0, 0), (255, 255, 255), (0, 255, 0), (0, 0, 255),
+          (255, 0, 0), (255, 255, 0), (255, 128, 0)]
+
+# Grid fill is vectorized when numpy is around (instant vs ~20 PIL
+# draw calls); the PIL fallback draws the same pattern line by line
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+try:
+    from waveshare_epd.epd7in3f import EPD
+    HAS_DISPLAY = True
+except:
+    HAS_DISPLAY = False
+
+
+@functools.lru_cache(maxsize=8)
+def _get_font(size):
+    """Load a font once per size - truetype parsing isn't free"""
+    try:
+        return ImageFont.truetype(FONT_PATH, size)
+    except OSError:
+        return ImageFont.load_default()
+
+
+def build_pattern():
+    """Build the test pattern image"""
+    if HAS_NUMPY:
+        arr = np.full((HEIGHT, WIDTH, 3), 255, dtype=np.uint8)
+        arr[::GRID, :] = (211, 211, 211)
+        arr[:, ::GRID] = (211, 211, 211)
+        arr[[0, -1], :] = 0
+        arr[:, [0, -1]] = 0
+        # Color swatches across the middle band
+        band = WIDTH // len(COLORS)
+        for i, color in enumerate(COLORS):
+            arr[200:280, i * band:(i + 1) * band] = color
+        img = Image.fromarray(arr)
+    else:
+        img = Image.new("RGB", (WIDTH, HEIGHT), (255, 255, 255))
+        draw = ImageDraw.Draw(img)
+        for x in range(0, WIDTH, GRID):
+            draw.line([(x, 0), (x, HEIGHT)], fill=(211, 211, 211))
+        for y in range(0, HEIGHT, GRID):
+            draw.line([(0, y), (WIDTH, y)], fill=(211, 211, 211))
+        draw.rectangle([0, 0, WIDTH - 1, HEIGHT - 1], outline=(0, 0, 0))
+        band = WIDTH // len(COLORS)
+        for i, color in enumerate(COLORS):
+            draw.rectangle([i * band, 200, (i + 1) * band - 1, 279], fill=color)
+
+    # Corner labels so a flipped/mirrored panel is obvious at a glance
+    draw = ImageDraw.Draw(img)
+    font = _get_font(20)
+    draw.text((10, 5), "TL", fill=(0, 0, 0), font=font)
+    draw.text((WIDTH - 40, 5), "TR", fill=(0, 0, 0), font=font)
+    draw.text((10, HEIGHT - 30), "BL", fill=(0, 0, 0), font=font)
+    draw.text((WIDTH - 40, HEIGHT - 30), "BR", fill=(0, 0, 0), font=font)
+
+    return img
+
+
+if __name__ == "__main__":
+    print("🎨 Building test pattern...")
+    img = build_pattern()
+
+    PNG_OUT.parent.mkdir(parents=True, exist_ok=True)
+    img.save(PNG_OUT)
+    print(f"✓ Saved: {PNG_OUT}")
+
+    if HAS_DISPLAY:
+        print("📟 Pushing to e-paper...")
+        epd = EPD()
+        epd.init()
+        epd.display(epd.getbuffer(img))
+        epd.sleep()
+        print("✅ Done - check alignment and color order")
+    else:
+        print("⚠ No e-paper display available - pattern saved only")
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Shared AVWX client for the weather dashboard.
+
+One canonical fetch path used by both main.py (the e-paper loop) and
+preview.py (the local testing tool): shared HTTP session, conditional
+GET caching, concurrent endpoint fetches, and the field formatting the
+template expects. Keeping it here means the two frontends can't drift.
+"""
+
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+import functools
+import json
+import sys
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Try orjson for parsing API payloads (2-5x faster), stdlib otherwise
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Try ciso8601's C parser for METAR timestamps, stdlib otherwise
+# (3.11+ fromisoformat accepts the Z suffix directly, no replace needed)
+try:
+    from ciso8601 import parse_rfc3339 as parse_metar_time
+except ImportError:
+    if sys.version_info >= (3, 11):
+        parse_metar_time = datetime.fromisoformat
+    else:
+        def parse_metar_time(value):
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+# API key location (read lazily so importing this module doesn't need it)
+API_KEY_FILE = Path("API_keys/avwxkeys.txt")
+
+# Persistent caches, shared by both frontends
+STATION_CACHE = Path("output/station_cache.json")
+LAST_DATA_PATH = Path("output/last_data.json")
+
+# Reused worker pool for the concurrent API calls
+EXECUTOR = ThreadPoolExecutor(max_workers=3)
+
+# C-level field extractors for the JSON-normalization loops
+_get_sanitized = itemgetter("sanitized")
+_get_repr = itemgetter("repr")
+
+@functools.cache
+def _api_key():
+    return API_KEY_FILE.read_text().strip()
+
+# Shared HTTP client. Prefer httpx with HTTP/2, which multiplexes the
+# AVWX calls over one TLS connection; otherwise a keep-alive requests
+# session. Both expose the same .get() shape for cached_get().
+@functools.cache
+def get_session():
+    try:
+        import httpx
+        return httpx.Client(http2=True,
+                            headers={"Authorization": f"Bearer {_api_key()}"},
+                            timeout=10,
+                            limits=httpx.Limits(max_keepalive_connections=4,
+                                                max_connections=4))
+    except ImportError:
+        session = requests.Session()
+        session.headers.update({"Authorization": f"Bearer {_api_key()}"})
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+        return session
+
+# Conditional-GET cache: url -> (etag, last_modified, parsed body, fetched_at)
+_http_cache = {}
+
+# Within these windows a cached response is served without any request
+# at all - stations are static, METARs hourly, TAFs every ~6 hours
+_CACHE_TTLS = (
+    ("/station/", 30 * 24 * 3600),
+    ("/metar/", 240),
+    ("/taf/", 1800),
+)
+
+def cached_get(url):
+    """GET a URL, using ETag/Last-Modified so unchanged responses cost no body"""
+    etag, last_modified, cached_body, fetched_at = _http_cache.get(
+        url, (None, None, None, 0))
+
+    # Fresh enough? Skip the network entirely
+    ttl = next((seconds for fragment, seconds in _CACHE_TTLS if fragment in url), 0)
+    if cached_body is not None and time.time() - fetched_at < ttl:
+        return cached_body
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    response = get_session().get(url, headers=headers, timeout=10)
+
+    # 304 = server says nothing changed, reuse the cached body
+    if response.status_code == 304 and cached_body is not None:
+        _http_cache[url] = (etag, last_modified, cached_body, time.time())
+        return cached_body
+
+    body = json_loads(response.content)
+    _http_cache[url] = (response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                        body, time.time())
+    return body
+
+def get_station_name(airport):
+    """Get the airport name, cached on disk - station data never changes"""
+    try:
+        cache = json.loads(STATION_CACHE.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        cache = {}
+
+    if airport in cache:
+        return cache[airport]
+
+    station = cached_get(f"https://avwx.rest/api/station/{airport}")
+    name = station["name"]
+
+    cache[airport] = name
+    STATION_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    STATION_CACHE.write_text(json.dumps(cache))
+    return name
+
+def fetch(airport, last_dt=None, debug=False):
+    """Get weather data from AVWX API
+
+    If the METAR's issuance string still equals last_dt, returns None
+    without fetching station/TAF - nothing downstream needs to run.
+    """
+    # Get METAR; if AVWX is down, fall back to the last good payload
+    # so the display stays useful instead of skipping the cycle
+    try:
+        metar = cached_get(f"https://avwx.rest/api/metar/{airport}?remove=true")
+    except Exception as e:
+        print(f"⚠ METAR fetch failed ({e}) - using last good data")
+        data = json_loads(LAST_DATA_PATH.read_bytes())
+        if isinstance(data.get("issued_dt"), str):
+            data["issued_dt"] = datetime.fromisoformat(data["issued_dt"])
+        # The marked dict gets persisted back to disk, so don't stack
+        # another marker on every failed cycle of a long outage
+        if not data["time"].endswith(" (STALE)"):
+            data["time"] = f"{data['time']} (STALE)"
+        return data
+
+    # Same METAR as last cycle - skip the rest of the pipeline
+    if last_dt is not None and metar["time"]["dt"] == last_dt:
+        return None
+
+    # Station and TAF are independent - fetch them concurrently
+    station_future = EXECUTOR.submit(get_station_name, airport)
+    taf_future = EXECUTOR.submit(
+        cached_get, f"https://avwx.rest/api/taf/{airport}")
+
+    # Get Station
+    try:
+        arpt_name = station_future.result()
+    except:
+        arpt_name = airport
+
+    # Get TAF
+    try:
+        taf = taf_future.result()
+        tafraw = list(map(_get_sanitized, taf["forecast"]))
+    except:
+        taf = None
+        tafraw = ["TAF not available"]
+
+    # Debug output (the only consumer of the full TAF dict - everything
+    # past here needs just tafraw, so drop the dict right after)
+    if debug:
+        print("\n" + "="*60)
+        print("RAW TAF JSON:")
+        print("="*60)
+        print(json.dumps(taf, indent=2))
+        print("="*60)
+        print("\nPARSED tafraw list:")
+        for i, line in enumerate(tafraw):
+            print(f"  [{i}] '{line}'")
+        print("="*60 + "\n")
+    del taf
+
+    # Extract weather data
+    winddir = metar["wind_direction"]["value"]
+    aarowdir = str((winddir + 180) % 360) + "deg"
+
+    # Format wind direction with leading zeros (e.g., 040)
+    winddir_formatted = f"{winddir:03d}"
+
+    # Format pressure to always show 4 digits (e.g., 29.10)
+    pressure = metar["altimeter"]["value"]
+    pressure_formatted = f"{pressure:.2f}"
+
+    wxcodes = metar["wx_codes"]
+    maincode = wxcodes[0]["value"] if wxcodes else None
+    if not maincode:
+        # The lowest reported layer decides; layers without an altitude
+        # (e.g. VV) count as high
+        lowest = min((layer.get("altitude", 999) for layer in metar["clouds"]),
+                     default=999)
+        maincode = "CLOUDY" if lowest < 100 else "SKY CLEAR"
+
+    dt = parse_metar_time(metar["time"]["dt"])
+
+    return {
+        "arpt": metar["station"],
+        "ArptName": arpt_name,
+        "rules": metar["flight_rules"],
+        "vis": metar["visibility"]["repr"],
+        "cig": list(map(_get_repr, metar["clouds"])),
+        "px": pressure_formatted,
+        "temp": metar["temperature"]["value"],
+        "dewpt": metar["dewpoint"]["value"],
+        "wind": metar["wind_speed"]["value"],
+        "gust": metar["wind_gust"],
+        "winddir": winddir_formatted,
+        "aarowdir": aarowdir,
+        "wxcode": list(map(_get_repr, wxcodes)),
+        "pa": metar["pressure_altitude"],
+        "da": metar["density_altitude"],
+        "obs": maincode,
+        "tafraw": tafraw,
+        "issued_dt": dt,
+        "time_dt_raw": metar["time"]["dt"],
+        "time": dt.strftime("%Y-%m-%d %H:%M:%S %Z"),
+    }